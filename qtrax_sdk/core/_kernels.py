@@ -0,0 +1,86 @@
+"""
+Runtime-specialized route-cost kernels.
+
+For a given problem the route length is fixed (a cycle over all nodes), so
+the loop bound can be baked in as a compile-time constant — numba then
+unrolls and hoists bounds checks in a way the generic kernels cannot.
+Specializations are built on demand by a factory and memoized per
+(length, layout); compilation costs a few ms, so callers must only
+request them for a length they will evaluate repeatedly (Problem keys on
+its fixed cycle length) — one-shot lengths belong on the generic kernels.
+
+numba.pycc AOT compilation is deprecated upstream, hence runtime
+specialization with an in-process cache instead of a shipped .so.
+"""
+import math
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from qtrax_sdk.models.problem_numba import edge_weight
+
+try:
+    from numba import njit  # type: ignore
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # type: ignore
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Missing edges count as this, matching the generic kernels
+INF_CLAMP = 1e9
+
+# Specializing pays for itself once compile time is amortized over many
+# evaluations of a long route; below this length the generic path wins.
+SPECIALIZE_MIN_LEN = 64
+
+_CACHE: Dict[Tuple[int, str], Callable] = {}
+
+
+def dense_route_cost_for(n: int) -> Callable:
+    """
+    Route-cost kernel over the dense matrix, specialized to routes of
+    length n (memoized). cache=True is unavailable for closures, so each
+    process compiles a given length at most once.
+    """
+    key = (n, "dense")
+    kern = _CACHE.get(key)
+    if kern is None:
+        @njit
+        def kern(D, route):  # type: ignore
+            total = 0.0
+            for k in range(n - 1):
+                w = D[route[k], route[k + 1]]
+                if math.isinf(w):
+                    total += INF_CLAMP
+                else:
+                    total += w
+            return total
+        _CACHE[key] = kern
+    return kern
+
+
+def csr_route_cost_for(n: int) -> Callable:
+    """CSR counterpart of dense_route_cost_for."""
+    key = (n, "csr")
+    kern = _CACHE.get(key)
+    if kern is None:
+        @njit
+        def kern(indptr, indices, weights, route):  # type: ignore
+            total = 0.0
+            for k in range(n - 1):
+                w = edge_weight(indptr, indices, weights, route[k], route[k + 1])
+                if math.isinf(w):
+                    total += INF_CLAMP
+                else:
+                    total += w
+            return total
+        _CACHE[key] = kern
+    return kern
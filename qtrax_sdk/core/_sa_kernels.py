@@ -0,0 +1,348 @@
+"""
+JIT-compiled inner loops for the mini simulated-annealing pass.
+
+The kernels operate on int32 *position* arrays (rows into the dense distance
+matrix), never on node IDs or Python objects, so a whole mini-SA run executes
+without interpreter dispatch. When numba is not installed the same functions
+run as plain Python — slower, but behaviourally identical.
+"""
+import math
+import numpy as np
+
+from qtrax_sdk.models.problem_numba import edge_weight
+
+try:
+    from numba import njit, prange  # type: ignore
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):  # type: ignore
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Missing edges (np.inf in the distance matrix) count as this, matching
+# tsp_total_cost, so SA rejects routes over removed edges. The kernels doing
+# that isinf check are compiled without fastmath — its ninf assumption folds
+# the check away and lets raw inf leak into costs.
+INF_CLAMP = 1e9
+
+# Quantized acceptance table: exp(x) sampled on [-20, 0]. Below -20 the
+# acceptance probability is ~2e-9 — effectively never — so it clamps to 0.
+_EXP_LUT = np.exp(np.linspace(-20.0, 0.0, 1024)).astype(np.float32)
+
+
+# RNG shims: under numba, np.random.* inside a jitted function targets
+# numba's per-thread RNG state, so the jitted wrappers keep that behaviour.
+# The pure-Python fallback routes through a module-private RandomState —
+# reseeding NumPy's global legacy RNG from library code is off limits.
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _seed(seed):
+        np.random.seed(seed)
+
+    @njit(cache=True)
+    def _randint(lo, hi):
+        return np.random.randint(lo, hi)
+
+    @njit(cache=True)
+    def _rand():
+        return np.random.random()
+else:
+    _FALLBACK_RNG = np.random.RandomState()
+
+    def _seed(seed):  # type: ignore
+        _FALLBACK_RNG.seed(seed)
+
+    def _randint(lo, hi):  # type: ignore
+        return _FALLBACK_RNG.randint(lo, hi)
+
+    def _rand():  # type: ignore
+        return _FALLBACK_RNG.random()
+
+
+@njit(cache=True, fastmath=True)
+def _accept_prob(delta, temperature):
+    """
+    Metropolis acceptance probability for a worsening move (delta >= 0),
+    served from the precomputed table instead of a per-iteration exp().
+    """
+    x = -delta / (temperature + 1e-9)
+    if x <= -20.0:
+        return 0.0
+    return _EXP_LUT[int((x + 20.0) * (1023.0 / 20.0))]
+
+
+@njit(cache=True)
+def _leg(D, u, v):
+    w = D[u, v]
+    if math.isinf(w):
+        return INF_CLAMP
+    return float(w)
+
+
+@njit(cache=True)
+def route_cost(D, route):
+    """Total cost of a route of positions, with missing edges clamped."""
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        total += _leg(D, route[k], route[k + 1])
+    return total
+
+
+@njit(cache=True)
+def route_cost_cutoff(D, route, cutoff):
+    """
+    route_cost with early exit: stops at the first prefix whose running sum
+    exceeds cutoff (the partial total, already > cutoff, is returned). Useful
+    when any cost beyond the cutoff is a guaranteed SA rejection.
+    """
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        total += _leg(D, route[k], route[k + 1])
+        if total > cutoff:
+            return total
+    return total
+
+
+@njit(cache=True)
+def segment_delta(D, route, i, j):
+    """
+    Cost change of reversing route[i:j] on a directed graph: the two boundary
+    edges change and every interior leg flips direction.
+    """
+    old = _leg(D, route[i - 1], route[i]) + _leg(D, route[j - 1], route[j])
+    new = _leg(D, route[i - 1], route[j - 1]) + _leg(D, route[i], route[j])
+    for k in range(i, j - 1):
+        old += _leg(D, route[k], route[k + 1])
+        new += _leg(D, route[k + 1], route[k])
+    return new - old
+
+
+@njit(cache=True, fastmath=True)
+def run_local_sa(D, route, start_temp, cooling_rate, min_temp,
+                 mini_iter, jump_prob, seed):
+    """
+    Full mini-SA pass over one route of positions.
+
+    2-opt moves are scored by segment_delta and applied in place; the rare
+    quantum-jump branch shuffles a sub-segment and re-scores the whole route.
+    Returns (best_route, best_cost).
+    """
+    _seed(seed)
+    n = route.shape[0]
+    current = route.copy()
+    current_cost = route_cost(D, current)
+    best = current.copy()
+    best_cost = current_cost
+    temperature = start_temp
+
+    for _ in range(mini_iter):
+        if n >= 4:
+            # Sample i < j in [1, n-2]
+            i = _randint(1, n - 1)
+            j = _randint(1, n - 1)
+            while j == i:
+                j = _randint(1, n - 1)
+            if j < i:
+                i, j = j, i
+
+            if _rand() < jump_prob:
+                # Quantum jump: Fisher-Yates shuffle of the sub-segment,
+                # full re-score, Metropolis accept.
+                candidate = current.copy()
+                for k in range(j - 1, i, -1):
+                    m = i + _randint(0, k - i + 1)
+                    tmp = candidate[k]
+                    candidate[k] = candidate[m]
+                    candidate[m] = tmp
+                # Anything costing more than current + 20*T has acceptance
+                # probability ~exp(-20) — a guaranteed reject — so stop
+                # summing as soon as that bound is crossed.
+                reject_bound = current_cost + 20.0 * (temperature + 1e-9)
+                candidate_cost = route_cost_cutoff(D, candidate, reject_bound)
+                delta = candidate_cost - current_cost
+                if delta < 0.0 or _rand() < _accept_prob(delta, temperature):
+                    current = candidate
+                    current_cost = candidate_cost
+            else:
+                # 2-opt: O(j-i) delta, in-place reverse on acceptance.
+                delta = segment_delta(D, current, i, j)
+                if delta < 0.0 or _rand() < _accept_prob(delta, temperature):
+                    lo, hi = i, j - 1
+                    while lo < hi:
+                        tmp = current[lo]
+                        current[lo] = current[hi]
+                        current[hi] = tmp
+                        lo += 1
+                        hi -= 1
+                    current_cost += delta
+
+            if current_cost < best_cost:
+                best = current.copy()
+                best_cost = current_cost
+
+        temperature *= cooling_rate
+        if temperature < min_temp:
+            break
+
+    return best, best_cost
+
+
+# ───────────────────────────── CSR variants ────────────────────────────────
+# Same fused propose-and-score loops as above, reading the Problem CSR arrays
+# instead of the dense matrix — used for graphs over the dense-matrix budget.
+
+
+@njit(cache=True)
+def _leg_csr(indptr, indices, weights, u, v):
+    w = edge_weight(indptr, indices, weights, u, v)
+    if math.isinf(w):
+        return INF_CLAMP
+    return w
+
+
+@njit(cache=True)
+def route_cost_csr(indptr, indices, weights, route):
+    """CSR counterpart of route_cost."""
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        total += _leg_csr(indptr, indices, weights, route[k], route[k + 1])
+    return total
+
+
+@njit(cache=True)
+def route_cost_cutoff_csr(indptr, indices, weights, route, cutoff):
+    """CSR counterpart of route_cost_cutoff (early exit past cutoff)."""
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        total += _leg_csr(indptr, indices, weights, route[k], route[k + 1])
+        if total > cutoff:
+            return total
+    return total
+
+
+@njit(cache=True)
+def segment_delta_csr(indptr, indices, weights, route, i, j):
+    """CSR counterpart of segment_delta (directed 2-opt reversal cost)."""
+    old = (_leg_csr(indptr, indices, weights, route[i - 1], route[i])
+           + _leg_csr(indptr, indices, weights, route[j - 1], route[j]))
+    new = (_leg_csr(indptr, indices, weights, route[i - 1], route[j - 1])
+           + _leg_csr(indptr, indices, weights, route[i], route[j]))
+    for k in range(i, j - 1):
+        old += _leg_csr(indptr, indices, weights, route[k], route[k + 1])
+        new += _leg_csr(indptr, indices, weights, route[k + 1], route[k])
+    return new - old
+
+
+@njit(cache=True, fastmath=True)
+def run_local_sa_csr(indptr, indices, weights, route, start_temp, cooling_rate,
+                     min_temp, mini_iter, jump_prob, seed):
+    """
+    run_local_sa over the CSR arrays: identical schedule, moves and
+    acceptance, with every leg scored by binary search instead of a dense
+    matrix load.
+    """
+    _seed(seed)
+    n = route.shape[0]
+    current = route.copy()
+    current_cost = route_cost_csr(indptr, indices, weights, current)
+    best = current.copy()
+    best_cost = current_cost
+    temperature = start_temp
+
+    for _ in range(mini_iter):
+        if n >= 4:
+            i = _randint(1, n - 1)
+            j = _randint(1, n - 1)
+            while j == i:
+                j = _randint(1, n - 1)
+            if j < i:
+                i, j = j, i
+
+            if _rand() < jump_prob:
+                candidate = current.copy()
+                for k in range(j - 1, i, -1):
+                    m = i + _randint(0, k - i + 1)
+                    tmp = candidate[k]
+                    candidate[k] = candidate[m]
+                    candidate[m] = tmp
+                reject_bound = current_cost + 20.0 * (temperature + 1e-9)
+                candidate_cost = route_cost_cutoff_csr(
+                    indptr, indices, weights, candidate, reject_bound)
+                delta = candidate_cost - current_cost
+                if delta < 0.0 or _rand() < _accept_prob(delta, temperature):
+                    current = candidate
+                    current_cost = candidate_cost
+            else:
+                delta = segment_delta_csr(indptr, indices, weights, current, i, j)
+                if delta < 0.0 or _rand() < _accept_prob(delta, temperature):
+                    lo, hi = i, j - 1
+                    while lo < hi:
+                        tmp = current[lo]
+                        current[lo] = current[hi]
+                        current[hi] = tmp
+                        lo += 1
+                        hi -= 1
+                    current_cost += delta
+
+            if current_cost < best_cost:
+                best = current.copy()
+                best_cost = current_cost
+
+        temperature *= cooling_rate
+        if temperature < min_temp:
+            break
+
+    return best, best_cost
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def batch_local_sa(D, routes, start_temp, cooling_rate, min_temp,
+                   mini_iter, jump_prob, base_seed):
+    """
+    Run one mini-SA pass per agent in parallel.
+
+    Agents are independent between collision-resolution sync points, so each
+    row of `routes` (shape: num_agents x route_len) anneals on its own thread.
+    Each agent seeds its thread RNG with base_seed + row index.
+    Returns (best_routes, best_costs).
+    """
+    num_agents = routes.shape[0]
+    best_routes = np.empty_like(routes)
+    best_costs = np.empty(num_agents, dtype=np.float64)
+    for a in prange(num_agents):
+        best, cost = run_local_sa(
+            D, routes[a], start_temp, cooling_rate, min_temp,
+            mini_iter, jump_prob, base_seed + a,
+        )
+        best_routes[a] = best
+        best_costs[a] = cost
+    return best_routes, best_costs
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def batch_local_sa_csr(indptr, indices, weights, routes, start_temp,
+                       cooling_rate, min_temp, mini_iter, jump_prob, base_seed):
+    """
+    CSR counterpart of batch_local_sa: one mini-SA pass per agent, prange
+    over the agent axis, each row seeded with base_seed + row index.
+    Returns (best_routes, best_costs).
+    """
+    num_agents = routes.shape[0]
+    best_routes = np.empty_like(routes)
+    best_costs = np.empty(num_agents, dtype=np.float64)
+    for a in prange(num_agents):
+        best, cost = run_local_sa_csr(
+            indptr, indices, weights, routes[a], start_temp, cooling_rate,
+            min_temp, mini_iter, jump_prob, base_seed + a,
+        )
+        best_routes[a] = best
+        best_costs[a] = cost
+    return best_routes, best_costs
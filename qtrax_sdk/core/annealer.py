@@ -2,12 +2,22 @@
 Simulated Annealing / Quantum-Inspired Annealer for Q-TRAX.
 This class manages the optimization loop, temperature schedule, and acceptance logic.
 """
+import inspect
 import math
-import random
-from typing import Any, Callable # type: ignore
+import numpy as np
+from typing import Any, Callable, Optional # type: ignore
 from qtrax_sdk.models.problem import Problem
 from qtrax_sdk.models.solution import Solution
 
+
+def _accepts_rng(fn: Callable) -> bool: # type: ignore
+    """Whether fn takes an `rng` keyword (the bundled move functions do)."""
+    try:
+        return 'rng' in inspect.signature(fn).parameters
+    except (TypeError, ValueError):  # builtins / odd callables
+        return False
+
+
 class Annealer:
     pass
     def __init__(
@@ -31,7 +41,13 @@ class Annealer:
         self.cooling_rate = cooling_rate
         self.min_temp = min_temp
         self.random_seed = random_seed
-        random.seed(random_seed)
+        # Per-instance RNG: never touches the module-global random state.
+        # Threaded into the move functions too (when they accept an `rng`
+        # kwarg) so the whole run is reproducible from random_seed, not just
+        # the acceptance draws.
+        self._rng = np.random.default_rng(random_seed)
+        self._init_takes_rng = _accepts_rng(initial_solution_fn)
+        self._neighbor_takes_rng = _accepts_rng(neighbor_fn)
 
     def acceptance_probability(self, old_cost: float, new_cost: float, temperature: float) -> float:
         if new_cost < old_cost:
@@ -39,18 +55,24 @@ class Annealer:
         return math.exp((old_cost - new_cost) / (temperature + 1e-9))
 
     def run(self) -> Solution:
-        current = self.initial_solution_fn(self.problem)
+        current = (
+            self.initial_solution_fn(self.problem, rng=self._rng) # type: ignore
+            if self._init_takes_rng else self.initial_solution_fn(self.problem)
+        )
         best = current
         current_cost = self.cost_fn(current, self.problem)
         best_cost = current_cost
         temperature = self.start_temp
 
         for iteration in range(self.max_iter): # type: ignore
-            neighbor = self.neighbor_fn(current, self.problem)
+            neighbor = (
+                self.neighbor_fn(current, self.problem, rng=self._rng) # type: ignore
+                if self._neighbor_takes_rng else self.neighbor_fn(current, self.problem)
+            )
             neighbor_cost = self.cost_fn(neighbor, self.problem)
 
             ap = self.acceptance_probability(current_cost, neighbor_cost, temperature)
-            if random.random() < ap:
+            if self._rng.random() < ap:
                 current = neighbor
                 current_cost = neighbor_cost
                 if current_cost < best_cost:
@@ -66,28 +88,26 @@ class Annealer:
 
 # --- Utility functions for TSP problems ---
 
-def tsp_total_cost(sol: Solution, problem: Problem) -> float:
-    total = 0.0
-    route = sol.routes
-    for i in range(len(route) - 1):
-        try:
-            total += problem.distance(route[i], route[i + 1])
-        except ValueError:
-            # Edge disappeared – treat as prohibitive so SA will reject the neighbour
-            total += 1e9
+def tsp_total_cost(sol: Solution, problem: Problem, cutoff: float = math.inf) -> float:
+    # One vectorized gather over the precomputed distance matrix; missing edges
+    # come back clamped to 1e9 so SA will reject the neighbour. A finite
+    # cutoff stops the evaluation at the first prefix that already guarantees
+    # rejection (the returned partial total exceeds the cutoff).
+    total = problem.route_cost(sol.routes, cutoff=cutoff)
     sol.total_cost = total
     return total
 
 
-def tsp_initial_solution(problem: Problem) -> Solution:
+def tsp_initial_solution(problem: Problem, rng: Optional[np.random.Generator] = None) -> Solution:
     """
     Generates a random initial TSP solution (random route, closes the cycle).
     """
-    import random
-    nodes = [node.id for node in problem.nodes]
-    route = nodes.copy()
-    random.shuffle(route)
+    if rng is None:
+        rng = np.random.default_rng()
+    nodes = np.fromiter((node.id for node in problem.nodes), dtype=np.int32,
+                        count=len(problem.nodes))
+    route = rng.permutation(nodes)
     # Ensure the route is a cycle
-    if route[0] != route[-1]:
-        route.append(route[0])
+    if route.size and route[0] != route[-1]:
+        route = np.append(route, route[0])
     return Solution(route, tsp_total_cost(Solution(route, 0.0), problem))
\ No newline at end of file
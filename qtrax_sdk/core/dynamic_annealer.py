@@ -2,14 +2,19 @@
 DynamicAnnealer: Runs a multi-agent, event-driven, quantum-inspired
 optimization loop on a changing graph.
 """
-import random
 import math
+import numpy as np
 from typing import List, Dict, Callable, Any # type: ignore
 from qtrax_sdk.models.problem import Problem
 from qtrax_sdk.models.solution import Solution
 from qtrax_sdk.models.agent import Agent
-from qtrax_sdk.core.neighbor import quantum_jump_neighbor
-from qtrax_sdk.core.annealer import tsp_total_cost
+from qtrax_sdk.core._sa_kernels import (
+    run_local_sa,
+    run_local_sa_csr,
+    batch_local_sa,
+    batch_local_sa_csr,
+)
+from qtrax_sdk.utils.event_bus import EventBus
 
 
 class DynamicAnnealer:
@@ -36,7 +41,7 @@ class DynamicAnnealer:
         :param cooling_rate: Temperature multiplication factor each mini‐iteration.
         :param min_temp: Minimum temperature threshold to break out of mini‐SA early.
         :param quantum_jump_prob: Probability of performing a "quantum jump" neighbor instead of 2‐opt.
-        :param random_seed: Seed to initialize Python’s random module.
+        :param random_seed: Seed for this annealer's private RNG (and the SA kernels).
         """
         self.problem = problem
         self.agents = agents
@@ -49,12 +54,42 @@ class DynamicAnnealer:
         self.quantum_jump_prob = quantum_jump_prob
         self.random_seed = random_seed
 
-        # Initialize the random seed for reproducibility
-        random.seed(random_seed)
+        # Per-instance RNG for reproducibility without touching global state
+        # (concurrent annealers no longer interfere with each other)
+        self._rng = np.random.default_rng(random_seed)
 
         # Track each agent's most recent full mini‐solution
         self.agent_solutions: Dict[str, Solution] = {agent.id: None for agent in agents} # type: ignore
 
+        # Counter used to derive a distinct, reproducible seed per mini-SA run
+        self._sa_calls = 0
+
+        # Snapshot of the node-id array, taken once: dynamic events only
+        # add/remove/reweight edges, never nodes, so no per-call rebuild
+        # (and no invalidation) is needed.
+        self._node_ids = problem._node_ids_arr
+
+        # Memoized per-node successor arrays for the fallback path; cleared
+        # lazily whenever the graph mutates (edge_blocked events).
+        self._neighbors: Dict[int, np.ndarray] = {}
+        self._neighbors_dirty = False
+        EventBus.subscribe("edge_blocked", self._on_edge_blocked)
+
+    def _on_edge_blocked(self, data: Any) -> None:
+        """Mark the neighbor cache stale; it is rebuilt lazily on next use."""
+        self._neighbors_dirty = True
+
+    def _cached_neighbors(self, node_id: int) -> np.ndarray:
+        """Return the successors of node_id as an int32 array, memoized."""
+        if self._neighbors_dirty:
+            self._neighbors.clear()
+            self._neighbors_dirty = False
+        arr = self._neighbors.get(node_id)
+        if arr is None:
+            arr = np.asarray(self.problem.get_neighbors(node_id), dtype=np.int32)
+            self._neighbors[node_id] = arr
+        return arr
+
     def _acceptance_probability(self, old_cost: float, new_cost: float, temperature: float) -> float:
         """
         Standard Metropolis acceptance probability.
@@ -64,74 +99,75 @@ class DynamicAnnealer:
             return 1.0
         return math.exp((old_cost - new_cost) / (temperature + 1e-9))
 
+    def _initial_cycle_positions(self, agent: Agent) -> np.ndarray:
+        """
+        Build a random cyclic route starting and ending at agent.current_node,
+        returned as int32 distance-matrix positions ready for the SA kernels.
+        """
+        # Build the route already rooted at agent.current_node: permute the
+        # remaining nodes and pin current_node at both ends. No linear
+        # .index() search or post-hoc swap needed — and the SA kernels never
+        # touch the endpoints, so index 0 stays current_node throughout.
+        nodes = self._node_ids
+        rest = self._rng.permutation(nodes[nodes != agent.current_node])
+        route = np.concatenate(([agent.current_node], rest, [agent.current_node]))
+        return self.problem._id_to_pos[route]
+
     def _local_sa(self, agent: Agent) -> Solution:
         """
         Run a Mini‐Simulated Annealing pass for a single agent to decide its next step.
-        We build a cyclic "mini-route" starting and ending at agent.current_node, then perform 'mini_iter'
-        annealing iterations using the quantum_jump_neighbor, and finally return the best Solution found.
+        We build a cyclic "mini-route" starting and ending at agent.current_node, then
+        hand the 'mini_iter' annealing iterations to the JIT'd kernel (plain Python if
+        numba is absent) and return the best Solution found.
 
         :param agent: The Agent for whom we’re optimizing the next move.
         :return: A Solution object representing the best cycle found. The next node is taken from Solution.routes.
         """
-        # 1) Collect all node IDs in the graph
-        nodes = [n.id for n in self.problem.nodes]
-
-        # 2) Build an initial random route that starts and ends at agent.current_node
-        route = nodes.copy()
-        random.shuffle(route)
-
-        # Ensure agent.current_node is at the front of the route
-        if route[0] != agent.current_node:
-            try:
-                idx = route.index(agent.current_node)
-                route[0], route[idx] = route[idx], route[0]
-            except ValueError:
-                # If somehow agent.current_node not in nodes (shouldn’t happen), insert it
-                route.insert(0, agent.current_node)
-
-        # Ensure the route ends back at agent.current_node (to form a cycle)
-        if route[-1] != agent.current_node:
-            route.append(agent.current_node)
-
-        # 3) Wrap in a Solution; cost will be calculated below
-        best_solution = Solution(route, None) # type: ignore
-        best_cost = tsp_total_cost(best_solution, self.problem)
-        temperature = self.start_temp
-
-        # 4) Mini-SA loop
-        for _ in range(self.mini_iter):
-            neighbor = quantum_jump_neighbor(best_solution, self.problem, jump_prob=self.quantum_jump_prob)
-            neighbor_cost = tsp_total_cost(neighbor, self.problem)
-
-            ap = self._acceptance_probability(best_cost, neighbor_cost, temperature)
-            if random.random() < ap:
-                best_solution = neighbor
-                best_cost = neighbor_cost
-
-            # Cool down
-            temperature *= self.cooling_rate
-            if temperature < self.min_temp:
-                break
+        pos_route = self._initial_cycle_positions(agent)
+        self._sa_calls += 1
+        seed = (self.random_seed + self._sa_calls * 9973) & 0x7FFFFFFF
+        if self.problem._D is not None:
+            best_pos, best_cost = run_local_sa(
+                self.problem._D,
+                pos_route,
+                self.start_temp,
+                self.cooling_rate,
+                self.min_temp,
+                self.mini_iter,
+                self.quantum_jump_prob,
+                seed,
+            )
+        else:
+            # Graph over the dense budget: score legs through the CSR arrays
+            best_pos, best_cost = run_local_sa_csr(
+                self.problem.indptr,
+                self.problem.indices,
+                self.problem.weights,
+                pos_route,
+                self.start_temp,
+                self.cooling_rate,
+                self.min_temp,
+                self.mini_iter,
+                self.quantum_jump_prob,
+                seed,
+            )
 
-        return best_solution
+        # 4) Translate positions back to node IDs
+        return Solution(self.problem._node_ids_arr[best_pos], best_cost)
 
-    def _detect_collisions(self, proposed_moves: Dict[str, int]) -> List[str]:
+    def _detect_collisions(self, next_nodes: np.ndarray) -> np.ndarray:
         """
-        Identify agents that propose to move to the same next_node during this tick.
-        Returns a list of agent IDs that are in collision—those agents will be blocked and not moved.
+        Identify proposals that target the same next_node during this tick.
+        Vectorized: one bincount over the proposed node IDs, then a boolean
+        mask of the proposals whose target is claimed more than once.
 
-        :param proposed_moves: Mapping of agent_id -> proposed next_node ID.
-        :return: List of agent IDs that are colliding.
+        :param next_nodes: Int array of proposed next-node IDs, one per agent.
+        :return: Boolean mask, True where the proposal collides.
         """
-        reverse_map: Dict[int, List[str]] = {}
-        for aid, node in proposed_moves.items():
-            reverse_map.setdefault(node, []).append(aid)
-
-        collisions: List[str] = []
-        for node, aids in reverse_map.items():
-            if len(aids) > 1:
-                collisions.extend(aids)
-        return collisions
+        if next_nodes.size == 0:
+            return np.zeros(0, dtype=bool)
+        counts = np.bincount(next_nodes)
+        return counts[next_nodes] > 1
 
     def run(self) -> None:
         """
@@ -146,13 +182,21 @@ class DynamicAnnealer:
         5) Unblock previously-blocked agents so they can try again next tick.
         6) If all agents are completed, break early; otherwise, proceed to next tick.
         """
+        # Running completion count so the all-done check is O(1) per tick
+        completed = sum(1 for a in self.agents if a.status == 'completed')
+
         for tick in range(self.max_tick):
             # 1) Apply any dynamic events (e.g., edge closures) for this tick
             if self.event_callback: # type: ignore
                 self.event_callback(tick)
 
-            # 2) Each agent proposes a next move
-            proposed_moves: Dict[str, int] = {}
+            # 2) Each agent proposes a next move. Agents are independent until
+            #    collision resolution, so their mini-SA passes run as one
+            #    parallel batch (prange over agents inside the kernel).
+            # Parallel arrays: proposing agents and their target nodes
+            proposed_agents: List[Agent] = []
+            proposed_nodes: List[int] = []
+            pending: List[Agent] = []
             for agent in self.agents:
                 # Skip agents not active
                 if agent.status != 'active':
@@ -161,45 +205,81 @@ class DynamicAnnealer:
                 # If already at goal, mark completed
                 if agent.current_node == agent.goal_node:
                     agent.status = 'completed'
+                    completed += 1
                     continue
 
-                # Run a mini-SA pass to get a full candidate cycle
-                best_solution = self._local_sa(agent)
+                pending.append(agent)
 
-                # From that cycle, find the index of the current_node
-                try:
-                    current_idx = best_solution.routes.index(agent.current_node)
-                except ValueError:
-                    # Fallback: if current_node somehow not in routes, pick a random neighbor
-                    neighbors = self.problem.get_neighbors(agent.current_node)
-                    if not neighbors:
+            if pending:
+                routes_arr = np.stack([self._initial_cycle_positions(a) for a in pending])
+                self._sa_calls += 1
+                base_seed = (self.random_seed + self._sa_calls * 9973) & 0x7FFFFFFF
+                if self.problem._D is not None:
+                    best_routes, best_costs = batch_local_sa(
+                        self.problem._D,
+                        routes_arr,
+                        self.start_temp,
+                        self.cooling_rate,
+                        self.min_temp,
+                        self.mini_iter,
+                        self.quantum_jump_prob,
+                        base_seed,
+                    )
+                else:
+                    # Graph over the dense budget: same parallel batch,
+                    # legs scored through the CSR arrays
+                    best_routes, best_costs = batch_local_sa_csr(
+                        self.problem.indptr,
+                        self.problem.indices,
+                        self.problem.weights,
+                        routes_arr,
+                        self.start_temp,
+                        self.cooling_rate,
+                        self.min_temp,
+                        self.mini_iter,
+                        self.quantum_jump_prob,
+                        base_seed,
+                    )
+            else:
+                best_routes, best_costs = None, None
+
+            for k, agent in enumerate(pending):
+                best_solution = Solution(
+                    self.problem._node_ids_arr[best_routes[k]], float(best_costs[k])
+                )
+
+                # current_node is pinned at index 0 by construction, so the
+                # next node is simply routes[1]
+                routes = best_solution.routes
+                if len(routes) < 2 or routes[0] != agent.current_node:
+                    # Fallback: degenerate cycle — pick a random neighbor
+                    neighbors = self._cached_neighbors(agent.current_node)
+                    if neighbors.size == 0:
                         agent.status = 'blocked'
                         continue
-                    next_node = random.choice(neighbors)
-                    proposed_moves[agent.id] = next_node
+                    next_node = int(self._rng.choice(neighbors))
+                    proposed_agents.append(agent)
+                    proposed_nodes.append(next_node)
                     continue
 
-                # The next node is the one immediately after current_idx
-                next_idx = (current_idx + 1) % len(best_solution.routes)
-                next_node = best_solution.routes[next_idx]
-                proposed_moves[agent.id] = next_node
+                next_node = int(routes[1])
+                proposed_agents.append(agent)
+                proposed_nodes.append(next_node)
 
                 # Save the full mini-Solution for later inspection
                 self.agent_solutions[agent.id] = best_solution
 
-            # 3) Detect and handle collisions
-            collisions = self._detect_collisions(proposed_moves)
-            for aid in collisions:
-                # Remove from proposed_moves so they don't move this tick
-                del proposed_moves[aid]
-                # Mark them blocked; next tick they can try again
-                blocked_agent = next(a for a in self.agents if a.id == aid)
-                blocked_agent.status = 'blocked'
-
-            # 4) Commit moves for non-colliding agents
-            for agent_id, next_node in proposed_moves.items():
-                moving_agent = next(a for a in self.agents if a.id == agent_id)
-                moving_agent.step_to(next_node)
+            # 3) Detect collisions (vectorized) and 4) commit the moves of the
+            #    non-colliding agents; colliders are blocked for this tick.
+            colliding = self._detect_collisions(np.asarray(proposed_nodes, dtype=np.int64))
+            for agent, next_node, hit in zip(proposed_agents, proposed_nodes, colliding):
+                if hit:
+                    # Mark them blocked; next tick they can try again
+                    agent.status = 'blocked'
+                else:
+                    agent.step_to(next_node)
+                    if agent.status == 'completed':
+                        completed += 1
 
             # 5) Unblock previously-blocked agents
             for agent in self.agents:
@@ -207,7 +287,7 @@ class DynamicAnnealer:
                     agent.status = 'active'
 
             # 6) Check if all agents have completed
-            if all(agent.status == 'completed' for agent in self.agents):
+            if completed == len(self.agents):
                 print(f"All agents completed by tick {tick}.")
                 break
 
@@ -1,11 +1,18 @@
-import random
+import numpy as np
 from typing import Optional # type: ignore
 
 from qtrax_sdk.models.solution import Solution
 from qtrax_sdk.models.problem import Problem
 
+# Fallback generator for callers that don't thread their own RNG through
+_DEFAULT_RNG = np.random.default_rng()
 
-def tsp_2opt_neighbor(current_solution: Solution, problem: Problem) -> Solution:
+
+def tsp_2opt_neighbor(
+    current_solution: Solution,
+    problem: Problem,
+    rng: Optional[np.random.Generator] = None,
+) -> Solution:
     """
     Perform a standard 2-opt swap on a TSP route.
 
@@ -14,7 +21,9 @@ def tsp_2opt_neighbor(current_solution: Solution, problem: Problem) -> Solution:
     3) Reverse the sub-segment between i and j.
     4) Return a new Solution with cost=None (annealer will recompute).
     """
-    route = current_solution.routes.copy()
+    if rng is None:
+        rng = _DEFAULT_RNG
+    route = np.array(current_solution.routes, dtype=np.int32)
     n = len(route)
 
     # If fewer than 4 points (including repeat of start at end), no 2-opt possible
@@ -22,9 +31,9 @@ def tsp_2opt_neighbor(current_solution: Solution, problem: Problem) -> Solution:
         return Solution(route, current_solution.total_cost, current_solution.meta)
 
     # Choose two indices i < j so that 1 <= i < j <= n-2 (keep endpoints intact)
-    i, j = sorted(random.sample(range(1, n - 1), 2))
-    # Reverse the sub-segment between i and j
-    route[i:j] = reversed(route[i:j])
+    i, j = np.sort(rng.choice(np.arange(1, n - 1), size=2, replace=False))
+    # Reverse the sub-segment between i and j (single C-level slice assignment)
+    route[i:j] = route[i:j][::-1]
 
     return Solution(route, None, current_solution.meta) # type: ignore
 
@@ -32,7 +41,8 @@ def tsp_2opt_neighbor(current_solution: Solution, problem: Problem) -> Solution:
 def quantum_jump_neighbor(
     current_solution: Solution,
     problem: Problem,
-    jump_prob: float = 0.05
+    jump_prob: float = 0.05,
+    rng: Optional[np.random.Generator] = None,
 ) -> Solution:
     """
     Quantum-inspired “jump” neighbor for TSP routes.
@@ -41,24 +51,31 @@ def quantum_jump_neighbor(
         * Perform a large shuffle of a random contiguous sub-segment of the route.
         * (“Quantum tunneling” to escape deep local minima.)
     - Otherwise:
-        * Fall back to a standard 2-opt swap.
+        * Perform a standard 2-opt swap.
 
-    Returns a new Solution with cost=None.
+    Both branches mutate the same single route copy — no re-dispatch through
+    tsp_2opt_neighbor, so the common path allocates one array and one
+    Solution instead of two of each. Returns a new Solution with cost=None.
     """
-    route = current_solution.routes.copy()
+    if rng is None:
+        rng = _DEFAULT_RNG
+    route = np.array(current_solution.routes, dtype=np.int32)
     n = len(route)
 
-    # If the route is too small or random() >= jump_prob, do a 2-opt instead
-    if n < 4 or random.random() >= jump_prob:
-        return tsp_2opt_neighbor(current_solution, problem)
+    # If the route is too small, neither move applies
+    if n < 4:
+        return Solution(route, current_solution.total_cost, current_solution.meta)
 
-    # Otherwise, perform a “quantum jump”:
-    # 1) Pick two points i < j in [1, n-2]
-    i, j = sorted(random.sample(range(1, n - 1), 2))
+    # Pick two points i < j in [1, n-2] (endpoints stay intact)
+    i, j = np.sort(rng.choice(np.arange(1, n - 1), size=2, replace=False))
 
-    # 2) Extract the sub-segment and shuffle it completely
-    segment = route[i:j]
-    random.shuffle(segment)
-    route[i:j] = segment
+    if rng.random() < jump_prob:
+        # “Quantum jump”: extract the sub-segment and shuffle it completely
+        segment = route[i:j].copy()
+        rng.shuffle(segment)
+        route[i:j] = segment
+    else:
+        # Standard 2-opt: in-place slice reverse
+        route[i:j] = route[i:j][::-1]
 
     return Solution(route, None, current_solution.meta) # type: ignore
\ No newline at end of file
@@ -13,9 +13,10 @@ import logging
 import os # type: ignore
 import random
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, TextIO
 
 import aiohttp # type: ignore
+import numpy as np
 from aiohttp import ClientTimeout, ClientSession, ClientResponse # type: ignore
 
 # ───────────────────────────────────────── helpers ──────────────────────────
@@ -30,17 +31,32 @@ def init_logging(log_path: str) -> None:
     )
 
 
+# The (source, target) pairs of the fully-connected scenario graph never
+# change between requests — only the weights do. Precompute them per size.
+_EDGE_PAIRS_CACHE: Dict[int, np.ndarray] = {}
+_PAYLOAD_RNG = np.random.default_rng()
+
+
+def _edge_pairs(num_nodes: int) -> np.ndarray:
+    pairs = _EDGE_PAIRS_CACHE.get(num_nodes)
+    if pairs is None:
+        idx = np.arange(1, num_nodes + 1, dtype=np.int32)
+        src, tgt = np.meshgrid(idx, idx, indexing="ij")
+        mask = src != tgt
+        pairs = np.stack((src[mask], tgt[mask]), axis=1)
+        _EDGE_PAIRS_CACHE[num_nodes] = pairs
+    return pairs
+
+
 def build_payload(num_nodes: int = 5, max_weight: float = 30.0) -> Dict[str, Any]:
     nodes: List[Dict[str, Any]] = [{"id": i, "attributes": {}} for i in range(1, num_nodes + 1)]
+    # One batched RNG fill for all N*(N-1) weights instead of a
+    # random.uniform call per edge
+    pairs = _edge_pairs(num_nodes)
+    weights = np.round(_PAYLOAD_RNG.uniform(5.0, max_weight, len(pairs)), 1)
     edges: List[Dict[str, Any]] = [
-        {
-            "source": i,
-            "target": j,
-            "weight": round(random.uniform(5.0, max_weight), 1),
-        }
-        for i in range(1, num_nodes + 1)
-        for j in range(1, num_nodes + 1)
-        if i != j
+        {"source": int(s), "target": int(t), "weight": float(w)}
+        for (s, t), w in zip(pairs, weights)
     ]
     starts = random.sample(range(1, num_nodes + 1), 2)
     remaining = [n for n in range(1, num_nodes + 1) if n not in starts]
@@ -76,8 +92,18 @@ async def poll_http_result(
     job_id: str,
     max_attempts: int,
     base_delay: float,
+    max_delay: float = 20.0,
 ) -> Optional[Dict[str, Any]]:
-    """Poll /job/{job_id}/result until finished or max_attempts exhausted."""
+    """
+    Poll /job/{job_id}/result until finished or max_attempts exhausted.
+
+    Retries use decorrelated-jitter backoff (AWS style): each wait is drawn
+    from uniform(base_delay, previous_delay * 3) and capped at max_delay, so
+    polls that started in the same burst spread out instead of waking in
+    lockstep with ever-doubling synchronized delays.
+    """
+    rng = random.Random(job_id)  # deterministic per job
+    delay = base_delay
     for attempt in range(1, max_attempts + 1):
         try:
             async with session.get(f"{api_url}/job/{job_id}/result") as resp: # type: ignore
@@ -85,7 +111,7 @@ async def poll_http_result(
                     return await resp.json() # type: ignore
 
                 if resp.status == 202: # type: ignore
-                    delay = base_delay * (2 ** (attempt - 1))
+                    delay = min(max_delay, rng.uniform(base_delay, delay * 3))
                     logging.info("Job %s not ready; retrying in %.1fs", job_id, delay)
                     await asyncio.sleep(delay)
                     continue
@@ -106,7 +132,8 @@ async def send_random_scenario(
     api_url: str,
     http_retries: int,
     http_base_delay: float,
-    save_path: Optional[str],
+    save_file: Optional[TextIO],
+    save_lock: asyncio.Lock,
 ) -> None:
     """Enqueue one random scenario and wait for its result."""
     payload = build_payload()
@@ -128,11 +155,13 @@ async def send_random_scenario(
     result = await poll_http_result(session, api_url, job_id, http_retries, http_base_delay) # type: ignore
     logging.info("[HTTP] Job %s => %s", job_id, result.get("routes") if result else None) # type: ignore
 
-    # optional JSONL dump
-    if result and save_path:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, "a") as fh:
-            fh.write(json.dumps({"job_id": job_id, "result": result}) + "\n")
+    # optional JSONL dump into the session-wide handle (opened once in
+    # generate_traffic — no per-result open/close syscalls)
+    if result and save_file:
+        line = json.dumps({"job_id": job_id, "result": result}) + "\n"
+        async with save_lock:
+            save_file.write(line)
+            save_file.flush()
 
 
 async def generate_traffic(
@@ -143,16 +172,66 @@ async def generate_traffic(
     save_path: Optional[str],
 ) -> None:
     timeout = ClientTimeout(connect=5, total=30) # type: ignore
-    async with aiohttp.ClientSession(timeout=timeout) as session: # type: ignore
-        while True:
-            tasks = [
-                asyncio.create_task(
-                    send_random_scenario(session, api_url, http_retries, http_base_delay, save_path) # type: ignore
-                )
-                for _ in range(rate_per_sec)
-            ]
-            await asyncio.gather(*tasks)
-            await asyncio.sleep(2)  # brief stagger before next burst
+
+    # Reuse TCP connections across bursts: size the pool to the burst rate and
+    # keep sockets alive well past the inter-burst gap so each request skips
+    # the handshake instead of reconnecting.
+    connector = aiohttp.TCPConnector( # type: ignore
+        limit=rate_per_sec * 4,
+        limit_per_host=rate_per_sec * 4,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+    )
+
+    # Open the results file once for the whole session; workers share the
+    # handle behind a lock instead of re-opening per finished job.
+    save_file: Optional[TextIO] = None
+    save_lock = asyncio.Lock()
+    if save_path:
+        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+        save_file = open(save_path, "a")
+
+    try:
+        async with aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            headers={"Connection": "keep-alive"},
+        ) as session: # type: ignore
+            # Steady token-bucket enqueue instead of burst + gather: one new
+            # scenario every 1/rate seconds, at most 2x rate in flight. A slow
+            # request only consumes its own token — it no longer stalls the
+            # whole next batch behind a gather barrier.
+            sem = asyncio.Semaphore(rate_per_sec * 2)
+            interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 1.0
+
+            async def _send_then_release() -> None:
+                try:
+                    await send_random_scenario(
+                        session, api_url, http_retries, http_base_delay, save_file, save_lock # type: ignore
+                    )
+                finally:
+                    sem.release()
+
+            # The event loop only holds weak references to tasks, so each one
+            # is anchored here until its done-callback removes it; the
+            # callback also surfaces worker failures instead of letting them
+            # die as "Task exception was never retrieved" at shutdown.
+            in_flight: set[asyncio.Task] = set()
+
+            def _reap(task: asyncio.Task) -> None:
+                in_flight.discard(task)
+                if not task.cancelled() and task.exception() is not None:
+                    logging.error("Traffic worker failed: %s", task.exception())
+
+            while True:
+                await sem.acquire()
+                task = asyncio.create_task(_send_then_release())
+                in_flight.add(task)
+                task.add_done_callback(_reap)
+                await asyncio.sleep(interval)
+    finally:
+        if save_file:
+            save_file.close()
 
 
 # ────────────────────────────────── CLI / main ──────────────────────────────
@@ -1,8 +1,17 @@
 # qtrax_sdk/main.py
 
-import typer  # type: ignore
+# typer lives in the `cli` extra, but the `qtrax` console script installs
+# unconditionally — fail with the remedy instead of a bare ModuleNotFoundError.
+try:
+    import typer  # type: ignore
+except ImportError:  # pragma: no cover - exercised only without the extra
+    import sys
+
+    sys.exit(
+        "The qtrax CLI requires the optional CLI dependencies.\n"
+        "Install them with: pip install 'qtrax-sdk[cli]'"
+    )
 from pathlib import Path
-from qtrax_sdk.core.optimizer import optimize_routes
 
 app = typer.Typer(help="Q-TRAX SDK CLI — Quantum-Inspired Logistics Optimizer") # type: ignore
 
@@ -17,7 +26,9 @@ def optimize(
     """
     Run the Q-TRAX optimization on a problem definition.
     """
-    
+    # Deferred so `qtrax --help` doesn't pay the solver's import cost
+    from qtrax_sdk.core.optimizer import optimize_routes
+
     # Validate config file path
     config_file = Path(config_path)
     if not config_file.exists():
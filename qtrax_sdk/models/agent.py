@@ -4,10 +4,25 @@ Tracks position, goal, and route history.
 """
 
 from __future__ import annotations
-from typing import List, Any
+from typing import Any
+
+import numpy as np
 
 
 class Agent:
+    # Fixed attribute layout: no per-instance __dict__, smaller footprint and
+    # C-level attribute access in the hot annealer loops.
+    __slots__ = (
+        "id",
+        "agent_id",
+        "start_node",
+        "current_node",
+        "goal_node",
+        "_route_buf",
+        "_route_len",
+        "status",
+    )
+
     def __init__(self, agent_id: str, start_node: int, goal_node: int) -> None:
         """
         :param agent_id: Unique identifier for this agent (e.g., "A1", "drone_02").
@@ -24,9 +39,19 @@ class Agent:
         self.goal_node: int = goal_node
 
         # runtime-tracking --------------------------------------------------
-        self.route: List[int] = [start_node]   # history of nodes visited
+        # Route history lives in a preallocated int32 buffer (doubled on
+        # demand), so long simulations append without list reallocation and
+        # post-processing can consume the array directly.
+        self._route_buf: np.ndarray = np.empty(8, dtype=np.int32)
+        self._route_buf[0] = start_node
+        self._route_len: int = 1
         self.status: str = "active"            # 'active', 'completed', or 'blocked'
 
+    @property
+    def route(self) -> np.ndarray:
+        """History of nodes visited, as an int32 array view."""
+        return self._route_buf[:self._route_len]
+
     # ---------------------------------------------------------------------
     # public helpers
     # ---------------------------------------------------------------------
@@ -36,7 +61,10 @@ class Agent:
         Append next_node to the route and mark 'completed' if goal reached.
         """
         self.current_node = next_node
-        self.route.append(next_node)
+        if self._route_len == self._route_buf.shape[0]:
+            self._route_buf = np.resize(self._route_buf, self._route_buf.shape[0] * 2)
+        self._route_buf[self._route_len] = next_node
+        self._route_len += 1
         if self.current_node == self.goal_node:
             self.status = "completed"
 
@@ -47,7 +75,9 @@ class Agent:
         self.start_node = new_start
         self.current_node = new_start
         self.goal_node = new_goal
-        self.route = [new_start]
+        # Reuse the existing buffer; just rewind the cursor
+        self._route_buf[0] = new_start
+        self._route_len = 1
         self.status = "active"
 
     # ---------------------------------------------------------------------
@@ -60,7 +90,7 @@ class Agent:
             "start": self.start_node,
             "goal": self.goal_node,
             "current": self.current_node,
-            "route": self.route,
+            "route": self.route.tolist(),
             "status": self.status,
         }
 
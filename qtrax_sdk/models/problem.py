@@ -4,12 +4,18 @@ Problem definition for Q-TRAX Algorithm.
 Models nodes, edges, and constraints for logistics optimization.
 """
 from typing import Dict, Any, List, Optional
+import numpy as np
 import networkx as nx  # type: ignore
 
+from qtrax_sdk.models import problem_numba
+from qtrax_sdk.core import _kernels
+
 class Node:
     """
     Represents a location (depot, warehouse, delivery point, etc.).
     """
+    __slots__ = ("id", "attributes")
+
     def __init__(self, node_id: int, attributes: Optional[Dict[str, Any]] = None):
         self.id = node_id
         self.attributes = attributes or {}
@@ -22,6 +28,8 @@ class Edge:
     """
     Represents a weighted edge between two nodes (distance, cost, time, etc.).
     """
+    __slots__ = ("source", "target", "weight", "attributes")
+
     def __init__(
         self,
         source: int,
@@ -44,7 +52,9 @@ class Edge:
 class Problem:
     """
     Full logistics problem definition: graph + constraints.
-    Uses a NetworkX DiGraph under the hood.
+    Adjacency lives in a CSR layout (indptr/indices/weights arrays) so the
+    annealer's hot lookups never touch Python dicts; a NetworkX DiGraph is
+    still available as a lazily-built fallback behind the `graph` property.
     Supports dynamic updates: add, remove, or change edges at runtime.
     """
     def __init__(
@@ -52,45 +62,280 @@ class Problem:
         nodes: List[Node],
         edges: List[Edge],
         constraints: Optional[Dict[str, Any]] = None,
+        precise: bool = False,
     ):
-        self.nodes = nodes
-        self.edges = edges
+        # Legacy object-list constructor: extract the id/weight columns and
+        # defer to the array path. Attribute dicts stay on the kept objects.
+        self._nodes: Optional[List[Node]] = nodes
+        self._edges: Optional[List[Edge]] = edges
         self.constraints = constraints or {}
-        self.graph = self._build_graph()
+        self._graph: Optional[nx.DiGraph] = None
+        self._precise = precise
+        m = len(edges)
+        self._init_from_arrays(
+            np.fromiter((n.id for n in nodes), dtype=np.int32, count=len(nodes)),
+            np.fromiter((e.source for e in edges), dtype=np.int32, count=m),
+            np.fromiter((e.target for e in edges), dtype=np.int32, count=m),
+            np.fromiter((e.weight for e in edges), dtype=np.float64, count=m),
+        )
 
-    def _build_graph(self) -> nx.DiGraph:
-        G = nx.DiGraph()
-        for node in self.nodes:
-            G.add_node(node.id, **node.attributes)  # type: ignore
-        for edge in self.edges:
-            G.add_edge( # type: ignore
-                edge.source,
-                edge.target,
-                weight=edge.weight,
-                **edge.attributes  # type: ignore
+    @classmethod
+    def from_arrays(
+        cls,
+        node_ids: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        constraints: Optional[Dict[str, Any]] = None,
+        precise: bool = False,
+    ) -> 'Problem':
+        """
+        Construct directly from id/weight columns — no transient Node/Edge
+        objects. The object lists exposed via .nodes / .edges materialize
+        lazily if someone asks for them.
+        """
+        self = cls.__new__(cls)
+        self._nodes = None
+        self._edges = None
+        self.constraints = constraints or {}
+        self._graph = None
+        self._precise = precise
+        self._init_from_arrays(
+            np.asarray(node_ids, dtype=np.int32),
+            np.asarray(sources, dtype=np.int32),
+            np.asarray(targets, dtype=np.int32),
+            np.asarray(weights, dtype=np.float64),
+        )
+        return self
+
+    def _init_from_arrays(
+        self,
+        node_ids: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        self._build_index(node_ids)
+        self._build_csr(sources, targets, weights)
+        self._build_distance_matrix()
+
+    def _build_index(self, node_ids: np.ndarray) -> None:
+        """Node-id lookup structures shared by the CSR and dense layouts."""
+        n = node_ids.size
+        self._node_ids_arr = node_ids
+        self._node_idx: Dict[int, int] = {
+            int(node_id): i for i, node_id in enumerate(node_ids)
+        }
+        max_id = int(node_ids.max()) if n else 0
+        # Direct id -> row lookup vector (node ids are small non-negative ints)
+        self._id_to_pos = np.full(max_id + 1, -1, dtype=np.int32)
+        self._id_to_pos[node_ids] = np.arange(n, dtype=np.int32)
+
+    def _build_csr(
+        self,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+    ) -> None:
+        """
+        Build the CSR adjacency: for row (position) u, the targets are
+        `indices[indptr[u]:indptr[u+1]]` (positions, sorted ascending) with
+        matching `weights`. Removed edges stay in place as np.inf tombstones,
+        so removal never reallocates the arrays.
+
+        Weights are stored float32 by default — half the memory traffic and
+        twice the SIMD width in the kernels, at ~7 significant digits, which
+        SA's accept/reject comparisons don't notice. Construct the Problem
+        with precise=True to keep float64. The Python-facing distance() dict
+        always keeps the exact input values either way.
+        """
+        n = self._node_ids_arr.size
+        # Validate endpoints before translating: an unknown id would either
+        # hit the -1 sentinel (silently rewiring the edge to the wrong row)
+        # or index out of bounds. Reject both with a clear error.
+        src = np.full(sources.shape, -1, dtype=np.int32)
+        tgt = np.full(targets.shape, -1, dtype=np.int32)
+        ok_s = (sources >= 0) & (sources < self._id_to_pos.size)
+        ok_t = (targets >= 0) & (targets < self._id_to_pos.size)
+        src[ok_s] = self._id_to_pos[sources[ok_s]]
+        tgt[ok_t] = self._id_to_pos[targets[ok_t]]
+        bad = (src < 0) | (tgt < 0)
+        if bad.any():
+            k = int(np.argmax(bad))
+            raise ValueError(
+                f"Edge ({sources[k]} -> {targets[k]}) references an unknown node"
             )
-        return G
+        order = np.lexsort((tgt, src))
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = tgt[order]
+        self.weights = weights[order].astype(
+            np.float64 if self._precise else np.float32
+        )
+        self._num_edges = int(sources.size)
+        # Hashed (u, v) -> weight mirror for Python-level distance() calls:
+        # one hash + one load beats a binary search from the interpreter.
+        self._weight: Dict[Any, float] = dict(
+            zip(zip(sources.tolist(), targets.tolist()), weights.tolist())
+        )
+
+    # Dense-matrix budget: beyond this the N×N float32 matrix is skipped and
+    # route costs fall back to the CSR kernels (sparse/huge graphs would blow
+    # memory for no SIMD win anyway).
+    _DENSE_LIMIT_BYTES = 64 * 1024 * 1024
+
+    def _build_distance_matrix(self) -> None:
+        """
+        Precompute a dense N×N float32 distance matrix (np.inf for missing edges)
+        so route costs can be evaluated with a single vectorized gather instead of
+        one Python-level distance() call per edge. Skipped (set to None) when
+        N×N×4 bytes would exceed _DENSE_LIMIT_BYTES.
+        """
+        n = self._node_ids_arr.size
+        if n * n * 4 > self._DENSE_LIMIT_BYTES:
+            self._D = None
+            return
+        self.ensure_dense()
+
+    def ensure_dense(self) -> np.ndarray:
+        """
+        Dense distance matrix, built on demand for callers that require it
+        (e.g. kernels with no CSR variant) regardless of the size budget.
+        """
+        if getattr(self, '_D', None) is None:
+            n = self._node_ids_arr.size
+            self._D = np.full((n, n), np.inf, dtype=np.float32)
+            rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+            self._D[rows, self.indices] = self.weights
+        return self._D
+
+    @property
+    def nodes(self) -> List[Node]:
+        if self._nodes is None:
+            self._nodes = [Node(int(i)) for i in self._node_ids_arr]
+        return self._nodes
+
+    @property
+    def edges(self) -> List[Edge]:
+        if self._edges is None:
+            ids = self._node_ids_arr
+            rows = np.repeat(
+                np.arange(ids.size, dtype=np.int32), np.diff(self.indptr)
+            )
+            self._edges = [
+                Edge(int(ids[u]), int(ids[v]), float(w))
+                for u, v, w in zip(rows, self.indices, self.weights)
+                if not np.isinf(w)
+            ]
+        return self._edges
+
+    def _edge_pos(self, source: int, target: int) -> int:
+        """
+        Index of edge (source, target) in the CSR arrays, or -1 if the pair is
+        absent or tombstoned. One binary search over the sorted row slice.
+        """
+        su = self._node_idx.get(source)
+        tv = self._node_idx.get(target)
+        if su is None or tv is None:
+            return -1
+        lo, hi = int(self.indptr[su]), int(self.indptr[su + 1])
+        pos = lo + int(np.searchsorted(self.indices[lo:hi], tv))
+        if pos >= hi or self.indices[pos] != tv or np.isinf(self.weights[pos]):
+            return -1
+        return pos
+
+    def route_cost(self, route: Any, cutoff: float = np.inf) -> float:
+        """
+        Vectorized total cost of a route (sequence of node IDs).
+        Missing edges are clamped to 1e9 so SA rejects the route instead of crashing.
+
+        If a finite `cutoff` is given, evaluation stops at the first prefix
+        whose running sum exceeds it and that partial sum (> cutoff) is
+        returned — callers comparing against the cutoff see the same
+        accept/reject outcome without paying for the remaining legs.
+        """
+        r = np.asarray(route)
+        if r.size < 2:
+            return 0.0
+        pos = self._id_to_pos[r]
+        # Specialize only the length evaluated thousands of times per solve:
+        # the problem's closed TSP cycle (all nodes + the repeated start).
+        # One-shot callers with arbitrary travelled-route lengths would pay a
+        # fresh jit compile each and grow the kernel cache without bound.
+        specialize = (
+            _kernels.HAVE_NUMBA
+            and r.size >= _kernels.SPECIALIZE_MIN_LEN
+            and r.size == self._node_ids_arr.size + 1
+        )
+        if self._D is None:
+            # CSR fallback for graphs over the dense budget. The full total
+            # exceeds a finite cutoff whenever any prefix does, so callers
+            # comparing against the cutoff get the same accept/reject outcome.
+            pos32 = pos.astype(np.int32)
+            if specialize:
+                return float(_kernels.csr_route_cost_for(r.size)(
+                    self.indptr, self.indices, self.weights, pos32
+                ))
+            return float(problem_numba.route_cost(
+                self.indptr, self.indices, self.weights, pos32
+            ))
+        if specialize and not np.isfinite(cutoff):
+            # Length-specialized kernel: loop bound is a compile-time constant
+            return float(_kernels.dense_route_cost_for(r.size)(
+                self._D, pos.astype(np.int32)
+            ))
+        legs = self._D[pos[:-1], pos[1:]]
+        legs = np.where(np.isinf(legs), 1e9, legs)
+        if np.isfinite(cutoff):
+            csum = np.cumsum(legs, dtype=np.float64)
+            k = int(np.searchsorted(csum, cutoff, side="right"))
+            return float(csum[min(k, csum.size - 1)])
+        return float(legs.sum(dtype=np.float64))
 
     def get_neighbors(self, node_id: int) -> List[int]:
-        return list(self.graph.successors(node_id))  # type: ignore
+        row = self._node_idx[node_id]
+        lo, hi = int(self.indptr[row]), int(self.indptr[row + 1])
+        cols = self.indices[lo:hi]
+        live = cols[~np.isinf(self.weights[lo:hi])]
+        return self._node_ids_arr[live].tolist()
 
     def distance(self, source: int, target: int) -> float:
-        if not self.graph.has_edge(source, target):  # type: ignore
-            raise ValueError(f"No edge from {source} to {target}")
-        return self.graph.edges[source, target]['weight']  # type: ignore
+        try:
+            return self._weight[source, target]
+        except KeyError:
+            raise ValueError(f"No edge from {source} to {target}") from None
 
     def update_edge_weight(self, source: int, target: int, new_weight: float) -> None:
-        if not self.graph.has_edge(source, target):  # type: ignore
+        pos = self._edge_pos(source, target)
+        if pos < 0:
             raise KeyError(f"No edge from {source} to {target} to update.")
-        self.graph[source][target]['weight'] = new_weight
+        self.weights[pos] = new_weight
+        self._weight[source, target] = new_weight
+        if self._D is not None:
+            self._D[self._node_idx[source], self._node_idx[target]] = new_weight
+        if self._graph is not None:
+            self._graph[source][target]['weight'] = new_weight
 
     def remove_edge(self, source: int, target: int) -> None:
         """
         Dynamically remove an edge from the graph.
-        If it doesn't exist, do nothing.
+        If it doesn't exist, do nothing. Removal tombstones the CSR slot
+        (weight -> np.inf) in place — no array reallocation.
         """
-        if self.graph.has_edge(source, target):  # type: ignore
-            self.graph.remove_edge(source, target)  # type: ignore
+        # O(1) membership check via the weight dict before paying for the
+        # binary search — the common no-op case costs one hash.
+        if (source, target) not in self._weight:
+            return
+        pos = self._edge_pos(source, target)
+        if pos < 0:
+            return
+        self.weights[pos] = np.inf
+        self._weight.pop((source, target), None)
+        if self._D is not None:
+            self._D[self._node_idx[source], self._node_idx[target]] = np.inf
+        self._num_edges -= 1
+        if self._graph is not None:
+            self._graph.remove_edge(source, target)  # type: ignore
 
     def add_edge(
         self,
@@ -100,24 +345,95 @@ class Problem:
         attributes: Optional[Dict[str, Any]] = None
     ) -> None:
         attrs = attributes or {}
-        self.graph.add_edge(source, target, weight=weight, **attrs)  # type: ignore
+        su = self._node_idx[source]
+        tv = self._node_idx[target]
+        lo, hi = int(self.indptr[su]), int(self.indptr[su + 1])
+        pos = lo + int(np.searchsorted(self.indices[lo:hi], tv))
+        if pos < hi and self.indices[pos] == tv:
+            # Existing slot (possibly a tombstone): just write the weight
+            if np.isinf(self.weights[pos]):
+                self._num_edges += 1
+            self.weights[pos] = weight
+        else:
+            # Brand-new pair: splice into the CSR arrays (rare, O(nnz))
+            self.indices = np.insert(self.indices, pos, tv)
+            self.weights = np.insert(self.weights, pos, weight)
+            self.indptr[su + 1:] += 1
+            self._num_edges += 1
+        self._weight[source, target] = weight
+        if self._D is not None:
+            self._D[su, tv] = weight
+        if self._graph is not None:
+            self._graph.add_edge(source, target, weight=weight, **attrs)  # type: ignore
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """
+        NetworkX view of the current adjacency, built on first access only —
+        the hot paths never pay for it. Kept in sync by the mutation methods
+        once materialized.
+        """
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
+
+    def _build_graph(self) -> nx.DiGraph:
+        # Built from the live CSR state (not self.edges) so late
+        # materialization reflects any runtime edge mutations. Attribute
+        # dicts only exist when the object lists were supplied up front.
+        G = nx.DiGraph()
+        attr_map = (
+            {(e.source, e.target): e.attributes for e in self._edges}
+            if self._edges is not None else {}
+        )
+        if self._nodes is not None:
+            for node in self._nodes:
+                G.add_node(node.id, **node.attributes)  # type: ignore
+        else:
+            G.add_nodes_from(self._node_ids_arr.tolist())  # type: ignore
+        ids = self._node_ids_arr
+        for row in range(ids.size):
+            u = int(ids[row])
+            for k in range(int(self.indptr[row]), int(self.indptr[row + 1])):
+                w = self.weights[k]
+                if np.isinf(w):
+                    continue
+                v = int(ids[self.indices[k]])
+                G.add_edge(u, v, weight=float(w), **attr_map.get((u, v), {}))  # type: ignore
+        return G
 
     def __repr__(self):
         return (
-            f"Problem(nodes={len(self.nodes)}, "
-            f"edges={self.graph.number_of_edges()}, " # type: ignore
+            f"Problem(nodes={self._node_ids_arr.size}, "
+            f"edges={self._num_edges}, "
             f"constraints={self.constraints})"
         )
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> 'Problem':
-        nodes = [Node(n['id'], n.get('attributes')) for n in data.get('nodes', [])]
-        edges = [
-            Edge(e['source'], e['target'], e['weight'], e.get('attributes'))
-            for e in data.get('edges', [])
-        ]
+    def from_dict(data: Dict[str, Any], precise: bool = False) -> 'Problem':
+        nodes_data = data.get('nodes', [])
+        edges_data = data.get('edges', [])
         constraints = data.get('constraints', {})
-        return Problem(nodes, edges, constraints)
+        # Attribute dicts are rare; when any are present, take the legacy
+        # object path so they survive. Otherwise build straight from columns.
+        if (any(n.get('attributes') for n in nodes_data)
+                or any(e.get('attributes') for e in edges_data)):
+            nodes = [Node(n['id'], n.get('attributes')) for n in nodes_data]
+            edges = [
+                Edge(e['source'], e['target'], e['weight'], e.get('attributes'))
+                for e in edges_data
+            ]
+            return Problem(nodes, edges, constraints, precise=precise)
+        m = len(edges_data)
+        return Problem.from_arrays(
+            np.fromiter((n['id'] for n in nodes_data), dtype=np.int32,
+                        count=len(nodes_data)),
+            np.fromiter((e['source'] for e in edges_data), dtype=np.int32, count=m),
+            np.fromiter((e['target'] for e in edges_data), dtype=np.int32, count=m),
+            np.fromiter((e['weight'] for e in edges_data), dtype=np.float64, count=m),
+            constraints,
+            precise=precise,
+        )
     
 
 
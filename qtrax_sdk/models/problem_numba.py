@@ -0,0 +1,78 @@
+"""
+JIT-compiled graph queries over the Problem CSR arrays.
+
+Each function takes the raw `indptr` / `indices` / `weights` arrays (and node
+*positions*, i.e. rows — translate ids through `Problem._id_to_pos` first) so
+it can be called from inside other njit kernels without boxing a Problem.
+Without numba the same functions run as plain Python.
+"""
+import math
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # type: ignore
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Missing / tombstoned edges count as this in route costs, matching the dense
+# kernels in core._sa_kernels.
+INF_CLAMP = 1e9
+
+
+@njit(cache=True)
+def neighbors(indptr, indices, weights, u):
+    """Live successor positions of row u (tombstoned slots skipped)."""
+    lo, hi = indptr[u], indptr[u + 1]
+    out = np.empty(hi - lo, dtype=np.int32)
+    count = 0
+    for k in range(lo, hi):
+        if not math.isinf(weights[k]):
+            out[count] = indices[k]
+            count += 1
+    return out[:count]
+
+
+@njit(cache=True)
+def edge_weight(indptr, indices, weights, u, v):
+    """
+    Weight of edge (u, v), or np.inf if the pair is absent or tombstoned.
+    Manual binary search over the sorted row slice — no allocation.
+    """
+    lo = indptr[u]
+    hi = indptr[u + 1]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if indices[mid] < v:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < indptr[u + 1] and indices[lo] == v:
+        return float(weights[lo])
+    return np.inf
+
+
+# No fastmath here: the inf-tombstone check relies on IEEE inf semantics.
+@njit(cache=True)
+def route_cost(indptr, indices, weights, route):
+    """
+    Total cost of a route of positions, summed in one tight loop.
+    Missing edges are clamped to INF_CLAMP so SA rejects instead of crashing.
+    """
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        w = edge_weight(indptr, indices, weights, route[k], route[k + 1])
+        if math.isinf(w):
+            total += INF_CLAMP
+        else:
+            total += w
+    return total
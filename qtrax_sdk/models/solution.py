@@ -7,9 +7,11 @@ from typing import Dict, List, Any # type: ignore
 class Solution:
     """
     Holds a candidate solution: route(s) and associated cost.
-    - For TSP: a single route (list of node ids)
-    - For VRP: dict of vehicle_id -> route (list of node ids)
+    - For TSP: a single route (int32 ndarray of node ids)
+    - For VRP: dict of vehicle_id -> route (list/array of node ids)
     """
+    __slots__ = ("routes", "total_cost", "meta")
+
     def __init__(
         self,
         routes: Any,  # Could be List[int] (TSP) or Dict[str, List[int]] (VRP)
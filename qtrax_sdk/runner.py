@@ -4,10 +4,12 @@ Standalone script runner for Q-TRAX optimization.
 Use this if you want to bypass CLI and invoke directly in code.
 """
 
-from qtrax_sdk.core.optimizer import optimize_routes
-
-
 def run():
+    # Lazy import: pulling in the optimizer (and transitively numpy,
+    # networkx, yaml, numba) only when actually solving keeps
+    # `import qtrax_sdk.runner` near-instant.
+    from qtrax_sdk.core.optimizer import optimize_routes
+
     config_file = "examples/sample_config.yaml"
     output_file = "outputs/solution.json"
 
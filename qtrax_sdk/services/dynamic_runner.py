@@ -5,19 +5,28 @@ Service to orchestrate dynamic, multi-agent solves using DynamicAnnealer.
 from __future__ import annotations
 
 import json
+import numpy as np
 import yaml
 from pathlib import Path
+
+# Prefer libyaml's C parser (~10x faster); fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
+# Prefer orjson for JSON config parsing; fall back to stdlib json
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson not available
+    orjson = None  # type: ignore
 from typing import List, Dict, Any
 
 from qtrax_sdk.models.agent import Agent
 from qtrax_sdk.models.problem import Problem
 from qtrax_sdk.models.solution import Solution
 from qtrax_sdk.core.dynamic_annealer import DynamicAnnealer
-from qtrax_sdk.utils.io_helpers import (
-    load_problem_yaml,
-    load_problem_json,
-    save_solution_json,
-)
+from qtrax_sdk.utils.io_helpers import save_solution_json
 from qtrax_sdk.utils.event_bus import EventBus
 
 
@@ -45,10 +54,38 @@ def get_node_id(node):  # type: ignore
 
 
 def try_int(val):  # type: ignore
-    try:
-        return int(val) # type: ignore
-    except Exception:
-        return val # type: ignore
+    # Tight branches instead of try/except: int() raising and unwinding per
+    # non-numeric value is far more expensive than these two checks. Only
+    # ASCII-decimal digits with at most one leading minus qualify — isdigit()
+    # also accepts superscripts etc. that int() rejects.
+    if isinstance(val, int):
+        return val
+    if isinstance(val, str):
+        digits = val[1:] if val.startswith("-") else val
+        if digits.isdecimal() and digits.isascii():
+            return int(val)
+    return val # type: ignore
+
+
+# Parsed-config memo: one entry per path, invalidated by mtime. Long-running
+# servers that re-solve the same scenario file skip the read+parse entirely.
+_CFG_CACHE: Dict[str, tuple[float, Dict[str, Any]]] = {}
+
+
+def _read_raw_cfg(path: Path, parse_json: bool) -> Dict[str, Any]:
+    key = str(path)
+    mtime = path.stat().st_mtime
+    cached = _CFG_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    # Read bytes once; both orjson and libyaml parse bytes directly
+    raw_bytes = path.read_bytes()
+    if parse_json:
+        raw = orjson.loads(raw_bytes) if orjson is not None else json.loads(raw_bytes)
+    else:
+        raw = yaml.load(raw_bytes, Loader=_YamlLoader)
+    _CFG_CACHE[key] = (mtime, raw)
+    return raw
 
 
 # ──────────────────────────────────────────────────────────────────────────
@@ -60,36 +97,51 @@ def dynamic_solve(
     *,
     use_yaml: bool = True,
     max_tick: int = 50,
-) -> Dict[str, Any]:
-    """Run DynamicAnnealer on a file-based problem definition."""
+) -> tuple[Dict[str, Any], Problem, List[Agent], Dict[str, Any]]:
+    """
+    Run DynamicAnnealer on a file-based problem definition.
+
+    Returns (results, problem, agents, raw_cfg) so callers can post-process
+    without re-reading and re-parsing the config file.
+    """
     config_path, output_path = Path(config_path), Path(output_path)
 
-    # 1. load problem graph -------------------------------------------------
-    problem: Problem = (
-        load_problem_yaml(config_path) if use_yaml else load_problem_json(config_path) # type: ignore
-    )
+    # No registry reset here: the bus holds subscribers weakly, so this
+    # solve's own registrations die with their owners, and callers'
+    # pre-registered subscribers must survive.
 
-    # 2. load raw config + agents ------------------------------------------
-    raw_cfg: Dict[str, Any] = (
-        yaml.safe_load(config_path.read_text())
-        if use_yaml
-        else json.loads(config_path.read_text())
-    )
-    agents: List[Agent] = load_agents_from_config(raw_cfg)
+    # 1. parse config once --------------------------------------------------
+    # Both the problem graph and the agents come from the same parsed dict;
+    # the file is read and parsed exactly once, and it is always the file the
+    # caller named (callers wanting the cheaper JSON parse pass a .json path
+    # with use_yaml=False).
+    raw_cfg: Dict[str, Any] = _read_raw_cfg(config_path, parse_json=not use_yaml)
+
+    problem: Problem = Problem.from_dict(raw_cfg)
 
-    # debug dump -----------------------------------------------------------
-    if __debug__ and agents:
-        print("Agent fields:", list(vars(agents[0]).keys()))
+    # 2. load agents --------------------------------------------------------
+    agents: List[Agent] = load_agents_from_config(raw_cfg)
 
     # 3. sanity-check IDs ---------------------------------------------------
-    node_ids = {try_int(get_node_id(n)) for n in problem.nodes} # type: ignore
-    for ag in agents:
-        start = try_int(ag.start_node)
-        goal = try_int(ag.goal_node)
-        if start not in node_ids or goal not in node_ids:
-            raise ValueError(
-                f"Agent {ag.id} refers to unknown node (start={start}, goal={goal})"
-            )
+    # Two np.isin calls over the canonical node-id array instead of a Python
+    # loop with per-agent set lookups. Non-numeric ids map to the -1
+    # sentinel, which can never match a node id.
+    starts = np.fromiter(
+        (s if isinstance(s := try_int(ag.start_node), int) else -1 for ag in agents),
+        dtype=np.int64, count=len(agents),
+    )
+    goals = np.fromiter(
+        (g if isinstance(g := try_int(ag.goal_node), int) else -1 for ag in agents),
+        dtype=np.int64, count=len(agents),
+    )
+    node_ids_arr = problem._node_ids_arr
+    valid = np.isin(starts, node_ids_arr) & np.isin(goals, node_ids_arr)
+    if not valid.all():
+        k = int(np.argmin(valid))
+        raise ValueError(
+            f"Agent {agents[k].id} refers to unknown node "
+            f"(start={try_int(agents[k].start_node)}, goal={try_int(agents[k].goal_node)})"
+        )
 
     # 4. optional event callback -------------------------------------------
     def on_tick(tick: int) -> None:
@@ -102,7 +154,12 @@ def dynamic_solve(
                 import logging
                 logging.exception("Error in on_tick: %s", exc)
 
-    EventBus.subscribe("edge_blocked", lambda d: print("EventBus:", d))
+    # Held in a local: the bus only keeps a weak reference, so the subscriber
+    # must stay strongly referenced for the duration of the solve.
+    def _echo_edge_blocked(d):  # type: ignore
+        print("EventBus:", d)
+
+    EventBus.subscribe("edge_blocked", _echo_edge_blocked)
 
     # 5. run annealer -------------------------------------------------------
     DynamicAnnealer(
@@ -119,6 +176,8 @@ def dynamic_solve(
     ).run()
 
     # 6. collect & persist results -----------------------------------------
+    # Routes stay int32 ndarrays all the way to serialization; orjson writes
+    # them natively and the stdlib fallback converts only at dump time.
     results = {ag.id: {"route": ag.route, "status": ag.status} for ag in agents} # type: ignore
 
     save_solution_json(
@@ -126,4 +185,4 @@ def dynamic_solve(
         output_path, # type: ignore
     )
     print(f"Dynamic solution written to {output_path}")
-    return results # type: ignore
\ No newline at end of file
+    return results, problem, agents, raw_cfg # type: ignore
\ No newline at end of file
@@ -12,6 +12,8 @@ def format_solution(
     """
     Format agent results into a clean Solution object.
     """
+    # Routes stay int32 ndarrays — orjson serializes them natively, so no
+    # per-agent .tolist() copy here.
     result_data = { # type: ignore
         agent.id: {
             "route": agent.route,
@@ -22,12 +24,14 @@ def format_solution(
     # Meta info (optional)
     meta = { # type: ignore
         "num_agents": len(agents),
-        "num_nodes": len(problem.nodes),
+        "num_nodes": int(problem._node_ids_arr.size),
         "mode": config.get("mode", "dynamic"),
     }
 
-    # Cost placeholder (to be computed later)
-    total_cost = 0.0
+    # Sum of travelled route costs, one vectorized gather per agent.
+    # Evaluated against the final graph state: legs over edges removed
+    # mid-run carry the 1e9 missing-edge clamp, flagging re-routed history.
+    total_cost = sum(problem.route_cost(agent.route) for agent in agents)
 
     return Solution(
         routes=result_data,
@@ -8,34 +8,83 @@ Example usage:
 
     EventBus.subscribe("edge_blocked", on_edge_blocked)
     EventBus.publish("edge_blocked", {"source": 2, "target": 3})
+
+Subscribers are held by weak reference: a callback dies with its owner
+instead of leaking in the class-level registry forever. Callers must
+therefore keep a strong reference to the callable for as long as it should
+stay subscribed (a bound method on a live object, a module-level function,
+or a local variable spanning the solve).
 """
 
-from typing import Callable, Dict, List, Any
+import types
+import weakref
+from typing import Callable, Dict, Optional, Tuple, Any
+
+# Shared default for events with no subscribers — publish never allocates
+_EMPTY: Tuple[Any, ...] = ()
+
+
+def _wrap(callback: Callable[[Any], None]) -> "weakref.ref[Any]":
+    # Bound Python methods are transient wrappers; WeakMethod keeps them
+    # alive as long as the owning instance is. The check must be an exact
+    # MethodType test — builtins like print also carry __self__ but are not
+    # weakly referenceable through WeakMethod.
+    if isinstance(callback, types.MethodType):
+        return weakref.WeakMethod(callback)
+    return weakref.ref(callback)
+
 
 class EventBus:
-    _subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+    # Copy-on-write: subscriber tuples are rebuilt on (un)subscribe so the
+    # hot publish path is a plain tuple iteration with no mutation hazards.
+    _subscribers: Dict[str, Tuple["weakref.ref[Any]", ...]] = {}
 
     @classmethod
     def subscribe(cls, event_name: str, callback: Callable[[Any], None]) -> None:
         """
         Subscribe callback(data) to events of type event_name.
         """
-        if event_name not in cls._subscribers:
-            cls._subscribers[event_name] = []
-        cls._subscribers[event_name].append(callback)
+        cls._subscribers[event_name] = (
+            cls._subscribers.get(event_name, _EMPTY) + (_wrap(callback),)
+        )
 
     @classmethod
     def unsubscribe(cls, event_name: str, callback: Callable[[Any], None]) -> None:
         """
         Remove a callback from an event’s subscriber list.
         """
-        if event_name in cls._subscribers:
-            cls._subscribers[event_name].remove(callback)
+        subs = cls._subscribers.get(event_name, _EMPTY)
+        for idx, ref in enumerate(subs):
+            if ref() == callback:
+                cls._subscribers[event_name] = subs[:idx] + subs[idx + 1:]
+                return
 
     @classmethod
     def publish(cls, event_name: str, data: Any) -> None:
         """
         Notify all subscribers to this event_name with data.
+        Dead references are compacted opportunistically.
+        """
+        subs = cls._subscribers.get(event_name, _EMPTY)
+        dead = False
+        for ref in subs:
+            callback = ref()
+            if callback is None:
+                dead = True
+            else:
+                callback(data)
+        if dead:
+            cls._subscribers[event_name] = tuple(
+                r for r in subs if r() is not None
+            )
+
+    @classmethod
+    def clear(cls, event_name: Optional[str] = None) -> None:
+        """
+        Drop all subscribers (or just those of event_name) — lets repeated
+        solves start from a clean registry.
         """
-        for callback in cls._subscribers.get(event_name, []):
-            callback(data)
\ No newline at end of file
+        if event_name is None:
+            cls._subscribers.clear()
+        else:
+            cls._subscribers.pop(event_name, None)
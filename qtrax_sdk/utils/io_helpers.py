@@ -4,42 +4,60 @@ Helpers for reading/writing problem definitions and solutions (YAML / JSON).
 """
 import yaml  # type: ignore
 import json
+from pathlib import Path
 from typing import Any, Dict  # type: ignore
 
+# Prefer libyaml's C parser (~10x faster); fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
+# Prefer orjson for solution dumps (~5-10x faster, serializes ndarrays
+# natively); fall back to stdlib json
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson not available
+    orjson = None  # type: ignore
+
 # Use relative imports so that Python finds the package correctly
-from qtrax_sdk.models.problem import Problem, Node, Edge # type: ignore
+from qtrax_sdk.models.problem import Problem # type: ignore
 from qtrax_sdk.models.solution import Solution # type: ignore
 
 
 
+def load_problem_from_dict(raw: Dict[str, Any]) -> Problem: # type: ignore
+    """
+    Build a `Problem` from an already-parsed config dict — for callers that
+    read and parse the file themselves (one I/O, one parse).
+    """
+    return Problem.from_dict(raw) # type: ignore
+
+
 def load_problem_yaml(path: str) -> Problem: # type: ignore
     """
     Load a YAML file describing nodes, edges, and constraints,
     and construct a `Problem` object.
     """
-    with open(path, "r") as f:
-        data = yaml.safe_load(f)
-
-    # Expecting data to have keys: nodes (list), edges (list), constraints (optional)
-    nodes_data = data.get("nodes", [])
-    edges_data = data.get("edges", [])
-    constraints = data.get("constraints", {})
-
-    nodes = [Node(item["id"], item.get("attributes")) for item in nodes_data] # type: ignore
-    edges = [ # type: ignore
-        Edge(item["source"], item["target"], item["weight"], item.get("attributes"))
-        for item in edges_data
-    ]
-
-    return Problem(nodes=nodes, edges=edges, constraints=constraints) # type: ignore
+    with open(path, "rb") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    return load_problem_from_dict(data) # type: ignore
 
 
 def save_solution_json(solution: Solution, path: str) -> None: # type: ignore
     """
     Serialize the Solution to JSON and write to `path`.
     """
+    payload = solution.to_dict() # type: ignore
+    if orjson is not None:
+        # OPT_SERIALIZE_NUMPY writes ndarray routes directly — no .tolist() copy
+        Path(path).write_bytes(
+            orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+        return
     with open(path, "w") as f:
-        json.dump(solution.to_dict(), f, indent=2) # type: ignore
+        # ndarray routes only become lists here, at the final encode
+        json.dump(payload, f, indent=2, default=lambda o: o.tolist()) # type: ignore
 
 
 def load_problem_json(path: str) -> Problem: # type: ignore
@@ -47,17 +65,6 @@ def load_problem_json(path: str) -> Problem: # type: ignore
     Load a JSON file describing a problem and return a `Problem` object.
     (Structure is the same as YAML.)
     """
-    with open(path, "r") as f:
-        data = json.load(f)
-
-    nodes_data = data.get("nodes", [])
-    edges_data = data.get("edges", [])
-    constraints = data.get("constraints", {})
-
-    nodes = [Node(item["id"], item.get("attributes")) for item in nodes_data] # type: ignore
-    edges = [ # type: ignore
-        Edge(item["source"], item["target"], item["weight"], item.get("attributes"))
-        for item in edges_data
-    ]
-
-    return Problem(nodes=nodes, edges=edges, constraints=constraints) # type: ignore
\ No newline at end of file
+    raw_bytes = Path(path).read_bytes()
+    data = orjson.loads(raw_bytes) if orjson is not None else json.loads(raw_bytes)
+    return load_problem_from_dict(data) # type: ignore
\ No newline at end of file
@@ -10,12 +10,26 @@ setup(
     author_email="contact@adocy.ai",
     packages=find_packages(exclude=["tests", "examples"]),
     install_requires=[
-        "pydantic>=2.0",
-        "typer[all]>=0.9",
-        "rich>=13.0",
         "numpy>=1.24",
-        "loguru>=0.7",
+        "networkx>=3.0",
+        "pyyaml>=6.0",
+        "orjson>=3.9",
     ],
+    extras_require={
+        # Only the `qtrax` CLI entry point needs typer/rich
+        "cli": [
+            "typer[all]>=0.9",
+            "rich>=13.0",
+        ],
+        # JIT-compiled SA kernels (pure-Python fallback without it)
+        "jit": [
+            "numba>=0.58",
+        ],
+        # async traffic generator
+        "traffic": [
+            "aiohttp>=3.9",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "qtrax = qtrax_sdk.main:app",
@@ -2,6 +2,6 @@ from qtrax_sdk.models.agent import Agent
 
 def test_agent_defaults():
     a = Agent(agent_id=1, start_node=10, goal_node=42) # type: ignore
-    assert a.route == [10]
+    assert a.route.tolist() == [10]
     assert a.current_node == 10
-    assert a.status == "idle"
\ No newline at end of file
+    assert a.status == "active"
\ No newline at end of file
@@ -0,0 +1,58 @@
+import pytest
+
+from qtrax_sdk.models.problem import Problem
+
+
+def make_problem():
+    return Problem.from_dict({
+        "nodes": [{"id": i} for i in range(1, 5)],
+        "edges": [
+            {"source": 1, "target": 2, "weight": 3.0},
+            {"source": 2, "target": 3, "weight": 4.0},
+            {"source": 3, "target": 1, "weight": 5.0},
+            {"source": 1, "target": 3, "weight": 7.0},
+        ],
+    })
+
+
+def test_distance_and_neighbors():
+    p = make_problem()
+    assert p.distance(1, 2) == 3.0
+    assert sorted(p.get_neighbors(1)) == [2, 3]
+    with pytest.raises(ValueError):
+        p.distance(2, 1)
+
+
+def test_remove_edge_tombstone():
+    p = make_problem()
+    p.remove_edge(1, 2)
+    assert p.get_neighbors(1) == [3]
+    with pytest.raises(ValueError):
+        p.distance(1, 2)
+    # re-adding revives the tombstoned slot
+    p.add_edge(1, 2, 9.0)
+    assert p.distance(1, 2) == 9.0
+
+
+def test_add_new_edge_pair():
+    p = make_problem()
+    p.add_edge(2, 4, 1.5)
+    assert p.distance(2, 4) == 1.5
+    assert sorted(p.get_neighbors(2)) == [3, 4]
+
+
+def test_unknown_edge_endpoints_rejected():
+    for bad_target in (3, 99):  # below and above the max declared id
+        with pytest.raises(ValueError):
+            Problem.from_dict({
+                "nodes": [{"id": 0}, {"id": 1}, {"id": 5}],
+                "edges": [{"source": 0, "target": bad_target, "weight": 7.0}],
+            })
+
+
+def test_lazy_graph_reflects_mutations():
+    p = make_problem()
+    p.update_edge_weight(1, 2, 8.0)
+    p.remove_edge(3, 1)
+    assert p.graph.edges[1, 2]["weight"] == 8.0
+    assert not p.graph.has_edge(3, 1)